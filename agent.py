@@ -1,6 +1,13 @@
+import asyncio
+import hashlib
 import json
 import logging
-from datetime import datetime
+import os
+import re
+import secrets
+import threading
+from datetime import datetime, timezone
+from cachetools import LRUCache, TTLCache, cached
 from fastapi import HTTPException
 from google import genai
 
@@ -14,22 +21,232 @@ from utils import (
     geometry_from_geojson, compute_ndvi, compute_walkability, compute_pm25,
     compute_population, simulate_replacement_with_buildings
 )
-from hedera_blockchain import HederaBlockchainService
+from hedera_blockchain import get_blockchain_service
 
 logger = logging.getLogger(__name__)
 
+_GEOMETRY_RESULTS = TTLCache(maxsize=1024, ttl=600)
+
+# Each notification opens its own SMTP login on a default-executor thread;
+# cap them so a large ZIP code cannot starve Gemini, Supabase and Earth Engine calls
+_EMAIL_SEND_LIMIT = asyncio.Semaphore(5)
+
+_INTENT_MODEL = os.getenv("PARKPULSE_INTENT_MODEL", "gemini-2.0-flash-lite")
+
+# Ordered (pattern, fields) table for the local pre-classifier. The first match
+# wins, so more specific intents must come before broader ones.
+_INTENT_PATTERNS = [
+    (re.compile(r"\bpropos(?:e|al)\b", re.I), {"intent": "create_proposal"}),
+    (re.compile(r"\breplaced?\s+(?:by|with)\s+(?:a\s+|an\s+)?buildings?\b", re.I),
+     {"intent": "park_removal_impact", "landUseType": "replaced_by_building"}),
+    (re.compile(r"\b(?:removed|removal)\b", re.I),
+     {"intent": "park_removal_impact", "landUseType": "removed"}),
+    (re.compile(r"\b(?:ndvi|how\s+green)\b", re.I), {"intent": "park_ndvi_query"}),
+    (re.compile(r"\b(?:pm\s?2\.?5|air\s+quality|pollution|polluted|air\s+safe)\b", re.I),
+     {"intent": "air_quality_query"}),
+    (re.compile(r"\basian\b", re.I), {"intent": "park_stat_query", "metric": "SUM_ASIAN_"}),
+    (re.compile(r"\b(?:kids|children)\b", re.I), {"intent": "park_stat_query", "metric": "SUM_KIDSVC"}),
+    (re.compile(r"\b(?:seniors?|elderly)\b", re.I), {"intent": "park_stat_query", "metric": "SUM_SENIOR"}),
+    (re.compile(r"\badults?\b", re.I), {"intent": "park_stat_query", "metric": "SUM_YOUNGP"}),
+    (re.compile(r"\b(?:population|how\s+many\s+people|people\s+live)\b", re.I),
+     {"intent": "park_stat_query", "metric": "SUM_TOTPOP"}),
+    (re.compile(r"\bhow\s+(?:big|large)\b|\bpark\s+(?:area|size)\b|\b(?:area|size)\s+of\b", re.I),
+     {"intent": "ask_area"}),
+    (re.compile(r"\b(?:tell\s+me\s+about|describe)\s+(?:this|the)\s+park\b|\bpark\s+info(?:rmation)?\b"
+                r"|\bwhen\s+was\s+(?:this|the)\s+park\s+(?:built|established|opened)\b", re.I),
+     {"intent": "park_info_query"}),
+    (re.compile(r"^\s*(?:hi|hello|hey|howdy|greetings|good\s+(?:morning|afternoon|evening))\b[\s!.,]*$", re.I),
+     {"intent": "greeting"}),
+]
+
+# The local fast path only resolves locations that cannot be misread: zip
+# codes and explicit "city X" / "state X" forms. Everything else ("parks in
+# LA", "parks near me") is left to Gemini.
+_SHOW_PARKS_RE = re.compile(r"\bparks\s+(?:in|near|for|around)\s+(?P<place>.+)$", re.I)
+_ZIP_PLACE_RE = re.compile(r"^(?:(?:the\s+)?zip\s*(?:code)?\s+)?(?P<value>\d{5})\b", re.I)
+_NAMED_PLACE_RE = re.compile(r"^(?:the\s+)?(?P<kind>city|state)\s+(?:of\s+)?(?P<value>.+)$", re.I)
+_PLACE_NAME_RE = re.compile(r"[a-z][a-z .'-]*", re.I)
+_BARE_ZIP_RE = re.compile(r"^\s*(?P<value>\d{5})\s*$")
+
+_PLACE_STOP_WORDS = frozenset({
+    "please", "pls", "now", "today", "thanks", "thank", "near", "around",
+    "me", "with", "that", "which", "and", "for",
+})
+
+_US_STATE_CODES = frozenset({
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI",
+    "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN",
+    "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH",
+    "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA",
+    "WV", "WI", "WY", "PR",
+})
+
+_YES_RE = re.compile(r"\b(?:yes|yeah|yep|sure|y|enable|fund\w*)\b", re.I)
+_NO_RE = re.compile(
+    r"\b(?:no|nope|nah|n|skip|without|don['\u2019]?t\s+(?:want|need|enable|fund\w*))\b", re.I
+)
+# "no fundraising", "don't want funding": negated funding words are not a yes
+_NEGATED_FUNDING_RE = re.compile(
+    r"\b(?:no|skip|without|don['\u2019]?t(?:\s+(?:want|need))?)\s+(?:to\s+)?"
+    r"(?:enable\s+|any\s+)*(?:enable\b|fund\w*)",
+    re.I,
+)
+_NUMBER_RE = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?")
+_DATE_RE = re.compile(
+    r"\b(\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august"
+    r"|september|october|november|december)\s+\d{4})\b",
+    re.I,
+)
+
+# unit -> (factor from acres, display label)
+_AREA_CONVERSIONS = {
+    "acres": (1.0, "acres"),
+    "m2": (4046.86, "m²"),
+    "km2": (0.00404686, "km²"),
+    "hectares": (0.404686, "hectares"),
+}
+
+_UNIT_PATTERNS = [
+    (re.compile(r"\bsquare\s+kilomet(?:er|re)s?\b|\bkm2\b|km²|\bsq\.?\s*km\b", re.I), "km2"),
+    (re.compile(r"\bsquare\s+met(?:er|re)s?\b|\bm2\b|m²|\bsq\.?\s*m\b", re.I), "m2"),
+    (re.compile(r"\bhectares?\b", re.I), "hectares"),
+    (re.compile(r"\bacres?\b", re.I), "acres"),
+]
+
+def _place_name(text):
+    """Leading place name in text, cut at the first filler word or punctuation"""
+    words = []
+    for word in text.split():
+        bare = word.rstrip(",;?!")
+        if not bare or bare.lower() in _PLACE_STOP_WORDS:
+            break
+        words.append(bare)
+        if bare != word:
+            break
+    name = " ".join(words).rstrip(".")
+    return name if _PLACE_NAME_RE.fullmatch(name) else None
+
+def _match_location(message):
+    """(locationType, locationValue) for unambiguous park queries, else None"""
+    match = _BARE_ZIP_RE.match(message)
+    if match:
+        return "zip", match.group("value")
+
+    match = _SHOW_PARKS_RE.search(message)
+    if not match:
+        return None
+    place = match.group("place").strip().rstrip("?!. ")
+
+    zip_match = _ZIP_PLACE_RE.match(place)
+    if zip_match:
+        return "zip", zip_match.group("value")
+
+    named = _NAMED_PLACE_RE.match(place)
+    if not named:
+        return None
+    kind = named.group("kind").lower()
+    value = _place_name(named.group("value"))
+    if not value:
+        return None
+    if len(value) <= 2:
+        if kind == "state" and value.upper() in _US_STATE_CODES:
+            return "state", value.upper()
+        return None
+    return kind, value
+
+def _fundraising_answer(message):
+    """True/False for a clear yes/no to fundraising, None when mixed or unclear"""
+    said_no = bool(_NO_RE.search(message))
+    said_yes = bool(_YES_RE.search(_NEGATED_FUNDING_RE.sub(" ", message)))
+    if said_yes == said_no:
+        return None
+    return said_yes
+
+def _fast_classify(message):
+    """Classify unambiguous queries locally; return None to defer to Gemini"""
+    location = _match_location(message)
+    if location:
+        location_type, value = location
+        return {"intent": "show_parks", "locationType": location_type, "locationValue": value}
+
+    for pattern, fields in _INTENT_PATTERNS:
+        if pattern.search(message):
+            parsed = dict(fields)
+            if parsed["intent"] == "ask_area":
+                for unit_pattern, unit in _UNIT_PATTERNS:
+                    if unit_pattern.search(message):
+                        parsed["unit"] = unit
+                        break
+            return parsed
+
+    return None
+
+_background_tasks = set()
+
+def _run_in_background(coro):
+    """Schedule a coroutine without awaiting it, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def shutdown_background_tasks(timeout: float = 10.0):
+    """Let in-flight background work finish, cancelling whatever outlives the timeout"""
+    if not _background_tasks:
+        return
+    _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if pending:
+        logger.warning(f"Cancelled {len(pending)} background task(s) at shutdown")
+
+_SESSION_STORAGE = None
+
 def get_session_storage():
-    from main import session_storage
-    return session_storage
+    global _SESSION_STORAGE
+    if _SESSION_STORAGE is None:
+        from main import session_storage
+        _SESSION_STORAGE = session_storage
+    return _SESSION_STORAGE
+
+async def log_user_message(session_id: str, session: dict, message: str):
+    """Create the session's HCS topic if needed and log the user message to it"""
+    if "hcs_topic_id" not in session:
+        try:
+            hedera_service = get_blockchain_service()
+            topic_result = await hedera_service.create_chat_topic(session_id)
+            if topic_result.get('success'):
+                session["hcs_topic_id"] = topic_result.get('topic_id')
+                logger.info(f"✅ HCS topic created for session {session_id}: {topic_result.get('topic_id')}")
+            else:
+                logger.warning(f"Failed to create HCS topic: {topic_result.get('error')}")
+        except Exception as e:
+            logger.warning(f"HCS topic creation failed (non-critical): {e}")
 
-async def log_agent_response(session_id: str, response: dict):
+    hcs_topic_id = session.get("hcs_topic_id")
+    if hcs_topic_id:
+        try:
+            hedera_service = get_blockchain_service()
+            await hedera_service.submit_chat_message(hcs_topic_id, "User", message)
+        except Exception as e:
+            logger.warning(f"Failed to log user message to HCS (non-critical): {e}")
+
+async def log_agent_response(session_id: str, response: dict, user_log_task=None):
     """Log agent response to HCS topic and include topic ID in response"""
     try:
         storage = get_session_storage()
-        hcs_topic_id = storage.get(session_id, {}).get("hcs_topic_id")
+        session = storage.get(session_id, {})
+
+        # The user message is logged in the background while the request is
+        # handled; wait for it so the topic exists and messages stay ordered.
+        if user_log_task:
+            await user_log_task
+
+        hcs_topic_id = session.get("hcs_topic_id")
 
         if hcs_topic_id:
-            hedera_service = HederaBlockchainService()
+            hedera_service = get_blockchain_service()
             agent_message = response.get("reply", "")
             await hedera_service.submit_chat_message(hcs_topic_id, "Agent", agent_message)
             response["hcsTopicId"] = hcs_topic_id
@@ -38,47 +255,7 @@ async def log_agent_response(session_id: str, response: dict):
 
     return response
 
-async def handle_agent_request(request: AgentRequest, client: genai.Client):
-    """Handle agent requests and process user queries about parks"""
-    try:
-        message = request.message
-        ui_context = request.uiContext or {}
-        selected_park_id = ui_context.get("selectedParkId")
-        session_id = request.sessionId or str(int(datetime.now().timestamp() * 1000000) % 1000000)
-        wallet_address = request.walletAddress
-
-        storage = get_session_storage()
-        if session_id not in storage:
-            storage[session_id] = {}
-
-        if "hcs_topic_id" not in storage[session_id]:
-            try:
-                hedera_service = HederaBlockchainService()
-                topic_result = await hedera_service.create_chat_topic(session_id)
-                if topic_result.get('success'):
-                    storage[session_id]["hcs_topic_id"] = topic_result.get('topic_id')
-                    logger.info(f"✅ HCS topic created for session {session_id}: {topic_result.get('topic_id')}")
-                else:
-                    logger.warning(f"Failed to create HCS topic: {topic_result.get('error')}")
-            except Exception as e:
-                logger.warning(f"HCS topic creation failed (non-critical): {e}")
-
-        hcs_topic_id = storage[session_id].get("hcs_topic_id")
-        if hcs_topic_id:
-            try:
-                hedera_service = HederaBlockchainService()
-                await hedera_service.submit_chat_message(hcs_topic_id, "User", message)
-            except Exception as e:
-                logger.warning(f"Failed to log user message to HCS (non-critical): {e}")
-                
-        if storage[session_id].get("awaiting_fundraising_response") or storage[session_id].get("awaiting_funding_goal"):
-            logger.info(f"Continuing proposal creation flow for session {session_id}")
-            response = await handle_create_proposal_intent(selected_park_id, session_id, message, wallet_address)
-            return await log_agent_response(session_id, response)
-
-        prompt = f"""Analyze this user query about parks and classify the intent:
-
-User query: "{message}"
+_INTENT_PROMPT_PREFIX = """Analyze the user query about parks below and classify the intent.
 
 Examples:
 - "show parks in Austin" -> show_parks intent, city location
@@ -115,72 +292,95 @@ Examples:
 - "create proposal with deadline 25th october 2025" -> create_proposal intent
 - "hello" -> greeting intent"""
 
-        try:
-            schema = {
-                "type": "OBJECT",
-                "properties": {
-                    "intent": {
-                        "type": "STRING",
-                        "enum": [
-                            "show_parks", "ask_area", "greeting", "unknown",
-                            "park_removal_impact", "park_ndvi_query", "park_stat_query",
-                            "park_info_query", "air_quality_query", "create_proposal"
-                        ]
-                    },
-                    "locationType": {"type": "STRING"},
-                    "locationValue": {"type": "STRING"},
-                    "unit": {"type": "STRING"},
-                    "landUseType": {"type": "STRING"},
-                    "metric": {"type": "STRING"}
-                },
-                "required": ["intent"]
-            }
+def _intent_cache_key(client, message):
+    """Case- and whitespace-insensitive cache key for a user query"""
+    return " ".join(message.lower().split())
+
+# Keyed on the normalized text, but Gemini still sees the original message so
+# place names keep their casing
+@cached(cache=LRUCache(maxsize=4096), key=_intent_cache_key, lock=threading.Lock())
+def _classify_cached(client, message):
+    """Classify a user query with Gemini, memoized per normalized message"""
+    prompt = _INTENT_PROMPT_PREFIX + f'\n\nUser query: "{message}"'
+
+    response = client.models.generate_content(
+        model=_INTENT_MODEL,
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": IntentClassification,
+        }
+    )
+    logger.info(f"Gemini structured response: {response.text}")
 
-            response = client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": schema,
-                }
-            )
-            logger.info(f"Gemini structured response: {response.text}")
+    if response.parsed is None:
+        raise ValueError(f"Response does not match IntentClassification: {response.text}")
+    return response.parsed
 
-            parsed = json.loads(response.text)
+def _classify_with_gemini(message, client):
+    """Classify the user query with Gemini structured output"""
+    try:
+        classification = _classify_cached(client, message)
+        parsed = classification.model_dump(mode="json", exclude_none=True)
+    except Exception as e:
+        logger.error(f"Gemini API error: {e}")
+        parsed = {"intent": "unknown"}
+
+    return parsed
+
+# Intent dispatch table; every entry takes
+# (parsed, selected_park_id, session_id, sess, message, wallet_address, client).
+_INTENT_HANDLERS = {
+    "show_parks": lambda p, pid, sid, sess, msg, wa, c: handle_show_parks_intent(p, sid),
+    "ask_area": lambda p, pid, sid, sess, msg, wa, c: handle_ask_area_intent(p, pid, sid),
+    "park_removal_impact": lambda p, pid, sid, sess, msg, wa, c: handle_park_removal_impact_intent(p, pid, sid, sess),
+    "park_ndvi_query": lambda p, pid, sid, sess, msg, wa, c: handle_park_ndvi_query_intent(pid, sid),
+    "park_stat_query": lambda p, pid, sid, sess, msg, wa, c: handle_park_stat_query_intent(p, pid, sid),
+    "park_info_query": lambda p, pid, sid, sess, msg, wa, c: handle_park_info_query_intent(pid, sid, c),
+    "air_quality_query": lambda p, pid, sid, sess, msg, wa, c: handle_air_quality_query_intent(pid, sid),
+    "create_proposal": lambda p, pid, sid, sess, msg, wa, c: handle_create_proposal_intent(pid, sid, msg, wa, c),
+    "greeting": lambda p, pid, sid, sess, msg, wa, c: handle_greeting_intent(sid),
+}
 
-        except Exception as e:
-            logger.error(f"Gemini API error: {e}")
-            parsed = {"intent": "unknown"}
+async def handle_agent_request(request: AgentRequest, client: genai.Client):
+    """Handle agent requests and process user queries about parks"""
+    try:
+        message = request.message
+        ui_context = request.uiContext or {}
+        selected_park_id = ui_context.get("selectedParkId")
+        session_id = request.sessionId or secrets.token_hex(6)
+        wallet_address = request.walletAddress
+
+        storage = get_session_storage()
+        sess = storage.get(session_id, {})
+        # Re-inserting on every message keeps active sessions from expiring
+        storage[session_id] = sess
+
+        user_log_task = _run_in_background(log_user_message(session_id, sess, message))
+
+        # A background proposal outcome that never reached the HCS topic is
+        # delivered as the reply to the user's next message
+        pending_proposal = sess.pop("last_proposal_result", None)
+        if pending_proposal:
+            return await log_agent_response(session_id, pending_proposal, user_log_task)
+
+        if sess.get("awaiting_fundraising_response") or sess.get("awaiting_funding_goal"):
+            logger.info(f"Continuing proposal creation flow for session {session_id}")
+            response = await handle_create_proposal_intent(selected_park_id, session_id, message, wallet_address, client)
+            return await log_agent_response(session_id, response, user_log_task)
+
+        parsed = _fast_classify(message)
+        if parsed:
+            logger.info(f"Fast-path intent match: {parsed}")
+        else:
+            parsed = await asyncio.to_thread(_classify_with_gemini, message, client)
 
         logger.info(f"Parsed intent: {parsed.get('intent')}")
 
-        if parsed.get("intent") == "show_parks":
-            response = await handle_show_parks_intent(parsed, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "ask_area":
-            response = await handle_ask_area_intent(parsed, selected_park_id, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "park_removal_impact":
-            response = await handle_park_removal_impact_intent(parsed, selected_park_id, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "park_ndvi_query":
-            response = await handle_park_ndvi_query_intent(selected_park_id, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "park_stat_query":
-            response = await handle_park_stat_query_intent(parsed, selected_park_id, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "park_info_query":
-            response = await handle_park_info_query_intent(selected_park_id, session_id, client)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "air_quality_query":
-            response = await handle_air_quality_query_intent(selected_park_id, session_id)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "create_proposal":
-            response = await handle_create_proposal_intent(selected_park_id, session_id, message, wallet_address)
-            return await log_agent_response(session_id, response)
-        elif parsed.get("intent") == "greeting":
-            response = handle_greeting_intent(session_id)
-            return await log_agent_response(session_id, response)
+        handler = _INTENT_HANDLERS.get(parsed.get("intent"))
+        if handler:
+            response = await handler(parsed, selected_park_id, session_id, sess, message, wallet_address, client)
+            return await log_agent_response(session_id, response, user_log_task)
 
         fallback_reply = "I'm ParkPulse.ai, your urban intelligence assistant. I can show parks by zipcode/city/state, analyze environmental impacts, or tell you about a selected park. Try asking: \"show parks in 90210\" or \"what happens if this park is removed?\""
         response = {
@@ -188,7 +388,7 @@ Examples:
             "action": "answer",
             "reply": fallback_reply,
         }
-        return await log_agent_response(session_id, response)
+        return await log_agent_response(session_id, response, user_log_task)
 
     except Exception as e:
         logger.error(f"Error in agent endpoint: {str(e)}")
@@ -242,20 +442,8 @@ async def handle_ask_area_intent(parsed, selected_park_id, session_id):
             "reply": "Could not find that park.",
         }
 
-    value = info["acres"]
-    unit = parsed.get("unit", "acres")
-    converted = value
-    unit_label = "acres"
-
-    if unit == "m2":
-        converted = value * 4046.86
-        unit_label = "m²"
-    elif unit == "km2":
-        converted = value * 0.00404686
-        unit_label = "km²"
-    elif unit == "hectares":
-        converted = value * 0.404686
-        unit_label = "hectares"
+    factor, unit_label = _AREA_CONVERSIONS.get(parsed.get("unit", "acres"), _AREA_CONVERSIONS["acres"])
+    converted = info["acres"] * factor
 
     formatted = f"{converted:,.2f}"
     reply = f"Area of \"{info['name']}\": {formatted} {unit_label}."
@@ -271,7 +459,7 @@ async def handle_ask_area_intent(parsed, selected_park_id, session_id):
         },
     }
 
-async def handle_park_removal_impact_intent(parsed, selected_park_id, session_id):
+async def handle_park_removal_impact_intent(parsed, selected_park_id, session_id, sess):
     """Handle park removal impact intent"""
     if not selected_park_id:
         return {
@@ -284,14 +472,11 @@ async def handle_park_removal_impact_intent(parsed, selected_park_id, session_id
         selected_park_id, parsed.get("landUseType", "removed")
     )
 
-    storage = get_session_storage()
-    if session_id not in storage:
-        storage[session_id] = {}
-
-    storage[session_id]["latest_removal_analysis"] = {
+    sess["latest_removal_analysis"] = {
         "park_id": selected_park_id,
+        "parkZip": impact.get("parkZip"),
         "analysis_data": impact,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
     return {
@@ -381,7 +566,7 @@ async def handle_air_quality_query_intent(selected_park_id, session_id):
         "data": air_quality_data,
     }
 
-def handle_greeting_intent(session_id):
+async def handle_greeting_intent(session_id):
     """Handle greeting intent"""
     reply = "Hello! Welcome to ParkPulse.ai - your AI-powered urban intelligence platform. Try: \"show parks of zipcode 20008\" or \"show parks of city Austin\"."
     return {
@@ -390,7 +575,7 @@ def handle_greeting_intent(session_id):
         "reply": reply,
     }
 
-async def handle_create_proposal_intent(selected_park_id, session_id, message, wallet_address=None):
+async def handle_create_proposal_intent(selected_park_id, session_id, message, wallet_address=None, client=None):
     """Handle create proposal intent with fundraising questions"""
     from supabase_client import check_user_authorization
 
@@ -424,8 +609,16 @@ async def handle_create_proposal_intent(selected_park_id, session_id, message, w
         }
 
     if storage[session_id].get("awaiting_fundraising_response"):
-        message_lower = message.lower().strip()
-        if any(word in message_lower for word in ['yes', 'yeah', 'yep', 'sure', 'y', 'enable', 'fund']):
+        # Submitting without fundraising cannot be undone, so anything short
+        # of a clear answer gets the clarification prompt
+        answer = _fundraising_answer(message)
+        if answer is False:
+            storage[session_id]["fundraising_enabled"] = False
+            storage[session_id]["funding_goal"] = 0
+            storage[session_id]["awaiting_fundraising_response"] = False
+
+            return await _submit_proposal(selected_park_id, session_id, message, wallet_address, storage, client)
+        elif answer:
             storage[session_id]["fundraising_enabled"] = True
             storage[session_id]["awaiting_fundraising_response"] = False
             storage[session_id]["awaiting_funding_goal"] = True
@@ -435,12 +628,6 @@ async def handle_create_proposal_intent(selected_park_id, session_id, message, w
                 "action": "ask_funding_goal",
                 "reply": "Great! What funding goal are you planning for this proposal?\n\nPlease specify the amount in HBAR (e.g., '100 HBAR' or '1000').",
             }
-        elif any(word in message_lower for word in ['no', 'nope', 'nah', 'n', 'skip', 'dont', "don't"]):
-            storage[session_id]["fundraising_enabled"] = False
-            storage[session_id]["funding_goal"] = 0
-            storage[session_id]["awaiting_fundraising_response"] = False
-
-            return await _create_proposal_with_settings(selected_park_id, session_id, message, wallet_address, storage)
         else:
             return {
                 "sessionId": session_id,
@@ -449,13 +636,12 @@ async def handle_create_proposal_intent(selected_park_id, session_id, message, w
             }
 
     if storage[session_id].get("awaiting_funding_goal"):
-        import re
-        numbers = re.findall(r'\d+(?:,\d{3})*(?:\.\d+)?', message)
+        numbers = _NUMBER_RE.findall(message)
         if numbers:
             goal_hbar = float(numbers[0].replace(',', ''))
             storage[session_id]["funding_goal"] = int(goal_hbar * 100000000)
             storage[session_id]["awaiting_funding_goal"] = False
-            return await _create_proposal_with_settings(selected_park_id, session_id, message, wallet_address, storage)
+            return await _submit_proposal(selected_park_id, session_id, message, wallet_address, storage, client)
         else:
             return {
                 "sessionId": session_id,
@@ -478,82 +664,97 @@ def _cleanup_proposal_session(storage, session_id):
         storage[session_id].pop("fundraising_enabled", None)
         storage[session_id].pop("funding_goal", None)
 
-async def _create_proposal_with_settings(selected_park_id, session_id, message, wallet_address, storage):
-    """Create the proposal with the configured fundraising settings"""
+async def _submit_proposal(selected_park_id, session_id, message, wallet_address, storage, client):
+    """Start proposal creation in the background and acknowledge it right away"""
+    # Without an HCS topic a background result has nowhere to be posted, so
+    # create the proposal inline and reply with the outcome directly
+    if not storage[session_id].get("hcs_topic_id"):
+        return await _proposal_outcome(selected_park_id, session_id, message, wallet_address, storage, client)
 
-    removal_analysis = storage[session_id]["latest_removal_analysis"]
-    analysis_data = removal_analysis["analysis_data"]
-    fundraising_enabled = storage[session_id].get("fundraising_enabled", False)
-    funding_goal = storage[session_id].get("funding_goal", 0)
-
-    end_date = "November 30, 2025"
-    if message:
-        message_lower = message.lower()
-        if "november 30" in message_lower or "30th november" in message_lower:
-            end_date = "November 30, 2025"
-        elif "date" in message_lower or "deadline" in message_lower:
-            import re
-            date_pattern = r'\b(\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4})\b'
-            date_match = re.search(date_pattern, message_lower)
-            if date_match:
-                end_date = date_match.group(1).title()
-
-    park_name = analysis_data.get("parkName", "Selected Park")
-
-    proposal_summary = f"""
-🏛️ **COMMUNITY PROPOSAL: PARK PROTECTION INITIATIVE**
-
-**Park:** {park_name}
-**Proposal Deadline:** {end_date}
-**Status:** OPEN FOR COMMUNITY INPUT
-
----
-
-**📊 ENVIRONMENTAL IMPACT ANALYSIS**
-
-**Vegetation Health Impact:**
-• Current NDVI: {analysis_data.get('ndviBefore', 'Unknown')}
-• Post-removal NDVI: {analysis_data.get('ndviAfter', 'Unknown')}
-• Vegetation loss: {round((analysis_data.get('ndviBefore', 0) - analysis_data.get('ndviAfter', 0)) * 100, 1) if analysis_data.get('ndviBefore') and analysis_data.get('ndviAfter') else 'Unknown'}%
-
-**Air Quality Impact:**
-• Current PM2.5: {analysis_data.get('pm25Before', 'Unknown')} μg/m³
-• Projected PM2.5: {analysis_data.get('pm25After', 'Unknown')} μg/m³
-• Pollution increase: +{analysis_data.get('pm25IncreasePercent', 'Unknown')}%
-
-**Community Impact:**
-• Population affected: {analysis_data.get('affectedPopulation10MinWalk', 0):,} residents
-• Demographics impacted:
-  - Children: {analysis_data.get('demographics', {}).get('kids', 0):,}
-  - Adults: {analysis_data.get('demographics', {}).get('adults', 0):,}
-  - Seniors: {analysis_data.get('demographics', {}).get('seniors', 0):,}
-
----
-
-**🎯 PROPOSAL SUMMARY**
-
-Based on the environmental impact analysis, removing {park_name} would significantly harm our community through:
-
-1. **Environmental Degradation:** {round((analysis_data.get('ndviBefore', 0) - analysis_data.get('ndviAfter', 0)) * 100, 1) if analysis_data.get('ndviBefore') and analysis_data.get('ndviAfter') else 'Significant'}% loss in vegetation health
-2. **Air Quality Decline:** {analysis_data.get('pm25IncreasePercent', 'Substantial')}% increase in air pollution
-3. **Community Health Impact:** {analysis_data.get('affectedPopulation10MinWalk', 0):,} residents losing access to green space
-
-**We propose to PROTECT this vital community asset and explore alternative development solutions that preserve environmental and public health.**
-
----
+    _run_in_background(_finalize_proposal(selected_park_id, session_id, message, wallet_address, storage, client))
+    return {
+        "sessionId": session_id,
+        "action": "proposal_submitting",
+        "reply": "⏳ Creating your community proposal...\n\nThe environmental impact analysis is being submitted to Hedera. The result will be posted to this chat's HCS topic as soon as it completes.",
+    }
 
-**📝 COMMUNITY ACTION ITEMS**
-• Review environmental impact data
-• Attend community meetings before {end_date}
-• Submit feedback to local planning committee
-• Share this proposal with neighbors and stakeholders
+async def _proposal_outcome(selected_park_id, session_id, message, wallet_address, storage, client):
+    """Create the proposal, turning an unexpected failure into an error reply"""
+    try:
+        return await _create_proposal_with_settings(selected_park_id, session_id, message, wallet_address, storage, client)
+    except Exception as e:
+        logger.error(f"Proposal creation failed for session {session_id}: {e}")
+        _cleanup_proposal_session(storage, session_id)
+        return {
+            "sessionId": session_id,
+            "action": "error",
+            "reply": "❌ Your proposal could not be created on Hedera. Please try again in a moment.",
+        }
 
----
+async def _finalize_proposal(selected_park_id, session_id, message, wallet_address, storage, client):
+    """Create the proposal and publish the outcome to the session's HCS topic"""
+    response = await _proposal_outcome(selected_park_id, session_id, message, wallet_address, storage, client)
+    response = await log_agent_response(session_id, response)
 
-*Environmental analysis generated by ParkPulse.ai on {removal_analysis.get('timestamp', 'recent analysis')}*
-*ParkPulse.ai - AI-Powered Urban Intelligence Platform*
-"""
+    # log_agent_response only sets hcsTopicId once the post went through;
+    # otherwise keep the outcome so the next turn can deliver it
+    if "hcsTopicId" not in response and session_id in storage:
+        storage[session_id]["last_proposal_result"] = response
 
+async def _notify_proposal_subscribers(park_zip, proposal_id, park_name, end_date, description):
+    """Email every user in the park's ZIP code about a newly created proposal"""
+    try:
+        from email_service import email_service
+        from database import get_users_by_zip_code
+
+        if not park_zip:
+            logger.warning(f"Could not determine park ZIP code, no emails sent for proposal #{proposal_id}")
+            return
+
+        users = await get_users_by_zip_code(park_zip)
+
+        async def send(user):
+            async with _EMAIL_SEND_LIMIT:
+                return await asyncio.to_thread(
+                    email_service.send_proposal_notification,
+                    recipient_email=user['email'],
+                    park_name=park_name,
+                    proposal_id=proposal_id,
+                    end_date=end_date,
+                    description=description
+                )
+
+        results = await asyncio.gather(*(send(user) for user in users), return_exceptions=True)
+
+        emails_sent = 0
+        for user, result in zip(users, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send email to {user['email']}: {result}")
+            elif result:
+                emails_sent += 1
+
+        if emails_sent > 0:
+            logger.info(f"Sent {emails_sent} email notifications to users in ZIP {park_zip} for proposal #{proposal_id}")
+        else:
+            logger.warning(f"No emails sent for proposal #{proposal_id} (ZIP: {park_zip}, {len(users)} users found)")
+
+    except Exception:
+        logger.exception("Error sending email notifications")
+
+def _stream_text_until(client, model, prompt, max_chars):
+    """Stream a Gemini completion, stopping once more than max_chars have arrived"""
+    parts = []
+    received = 0
+    for chunk in client.models.generate_content_stream(model=model, contents=prompt):
+        text = chunk.text or ""
+        parts.append(text)
+        received += len(text)
+        if received > max_chars:
+            break
+    return "".join(parts)
+
+async def _generate_frontend_description(client, park_name):
+    """Generate the short, neutral proposal description shown in the frontend"""
     frontend_description_prompt = f"""Generate a neutral, objective 600-character description for a community proposal about {park_name}.
 
 Environmental data:
@@ -573,11 +774,9 @@ Requirements:
 - Include more details about the park's role in the community"""
 
     try:
-        frontend_desc_response = client.models.generate_content(
-            model="gemini-2.0-flash-exp",
-            contents=frontend_description_prompt
-        )
-        frontend_description = frontend_desc_response.text.strip()
+        frontend_description = (await asyncio.to_thread(
+            _stream_text_until, client, "gemini-2.0-flash-exp", frontend_description_prompt, 600
+        )).strip()
 
         if len(frontend_description) > 600:
             frontend_description = frontend_description[:597] + "..."
@@ -587,6 +786,102 @@ Requirements:
         logger.error(f"Error generating frontend description with Gemini: {e}")
         frontend_description = f"This park provides essential green space serving thousands of local residents including families with children and seniors. Its removal would result in significantly reduced air quality, decreased vegetation health, and loss of recreational opportunities for the surrounding community. The park serves as a vital gathering place where neighbors connect and children play safely. The environmental impact would extend beyond the immediate area, affecting air quality and reducing the overall livability of the neighborhood for current and future residents."
 
+    return frontend_description
+
+async def _create_proposal_with_settings(selected_park_id, session_id, message, wallet_address, storage, client):
+    """Create the proposal with the configured fundraising settings"""
+
+    removal_analysis = storage[session_id]["latest_removal_analysis"]
+    analysis_data = removal_analysis["analysis_data"]
+    fundraising_enabled = storage[session_id].get("fundraising_enabled", False)
+    funding_goal = storage[session_id].get("funding_goal", 0)
+
+    end_date = "November 30, 2025"
+    if message:
+        message_lower = message.lower()
+        if "november 30" in message_lower or "30th november" in message_lower:
+            end_date = "November 30, 2025"
+        elif "date" in message_lower or "deadline" in message_lower:
+            date_match = _DATE_RE.search(message_lower)
+            if date_match:
+                end_date = date_match.group(1).title()
+
+    park_name = analysis_data.get("parkName", "Selected Park")
+
+    # Gemini and the Hedera health check are independent; run them while the
+    # summary is assembled.
+    blockchain_service = get_blockchain_service()
+    description_task = asyncio.create_task(_generate_frontend_description(client, park_name))
+    connected_task = asyncio.create_task(blockchain_service.is_connected())
+
+    ndvi_before = analysis_data.get('ndviBefore')
+    ndvi_after = analysis_data.get('ndviAfter')
+    ndvi_loss_pct = round((ndvi_before - ndvi_after) * 100, 1) if ndvi_before and ndvi_after else None
+
+    demographics = analysis_data.get('demographics', {})
+    affected_population = analysis_data.get('affectedPopulation10MinWalk', 0)
+
+    parts = [
+        "🏛️ **COMMUNITY PROPOSAL: PARK PROTECTION INITIATIVE**",
+        "",
+        f"**Park:** {park_name}",
+        f"**Proposal Deadline:** {end_date}",
+        "**Status:** OPEN FOR COMMUNITY INPUT",
+    ]
+    if fundraising_enabled:
+        parts.append(f"**Funding Goal:** {funding_goal / 100_000_000:,.2f} HBAR")
+    parts += [
+        "",
+        "---",
+        "",
+        "**📊 ENVIRONMENTAL IMPACT ANALYSIS**",
+        "",
+        "**Vegetation Health Impact:**",
+        f"• Current NDVI: {analysis_data.get('ndviBefore', 'Unknown')}",
+        f"• Post-removal NDVI: {analysis_data.get('ndviAfter', 'Unknown')}",
+        f"• Vegetation loss: {ndvi_loss_pct if ndvi_loss_pct is not None else 'Unknown'}%",
+        "",
+        "**Air Quality Impact:**",
+        f"• Current PM2.5: {analysis_data.get('pm25Before', 'Unknown')} μg/m³",
+        f"• Projected PM2.5: {analysis_data.get('pm25After', 'Unknown')} μg/m³",
+        f"• Pollution increase: +{analysis_data.get('pm25IncreasePercent', 'Unknown')}%",
+        "",
+        "**Community Impact:**",
+        f"• Population affected: {affected_population:,} residents",
+        "• Demographics impacted:",
+        f"  - Children: {demographics.get('kids', 0):,}",
+        f"  - Adults: {demographics.get('adults', 0):,}",
+        f"  - Seniors: {demographics.get('seniors', 0):,}",
+        "",
+        "---",
+        "",
+        "**🎯 PROPOSAL SUMMARY**",
+        "",
+        f"Based on the environmental impact analysis, removing {park_name} would significantly harm our community through:",
+        "",
+        f"1. **Environmental Degradation:** {ndvi_loss_pct if ndvi_loss_pct is not None else 'Significant'}% loss in vegetation health",
+        f"2. **Air Quality Decline:** {analysis_data.get('pm25IncreasePercent', 'Substantial')}% increase in air pollution",
+        f"3. **Community Health Impact:** {affected_population:,} residents losing access to green space",
+        "",
+        "**We propose to PROTECT this vital community asset and explore alternative development solutions that preserve environmental and public health.**",
+        "",
+        "---",
+        "",
+        "**📝 COMMUNITY ACTION ITEMS**",
+        "• Review environmental impact data",
+        f"• Attend community meetings before {end_date}",
+        "• Submit feedback to local planning committee",
+        "• Share this proposal with neighbors and stakeholders",
+        "",
+        "---",
+        "",
+        f"*Environmental analysis generated by ParkPulse.ai on {removal_analysis.get('timestamp', 'recent analysis')}*",
+        "*ParkPulse.ai - AI-Powered Urban Intelligence Platform*",
+    ]
+    proposal_summary = "\n".join(parts)
+
+    frontend_description = await description_task
+
     proposal_data = {
         "parkId": selected_park_id,
         "parkName": park_name,
@@ -594,16 +889,14 @@ Requirements:
         "endDate": end_date,
         "analysisData": analysis_data,
         "frontendDescription": frontend_description,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "fundraisingEnabled": fundraising_enabled,
         "fundingGoal": funding_goal,
         "creator": wallet_address
     }
 
     try:
-        from hedera_blockchain import HederaBlockchainService as BlockchainService
-        blockchain_service = BlockchainService()
-        if not await blockchain_service.is_connected():
+        if not await connected_task:
             logger.warning("Blockchain not connected, creating proposal locally only")
             _cleanup_proposal_session(storage, session_id)
             return {
@@ -616,53 +909,15 @@ Requirements:
         blockchain_result = await blockchain_service.create_proposal_on_blockchain(proposal_data)
 
         if blockchain_result['success']:
-            try:
-                from email_service import email_service
-                from database import get_users_by_zip_code
-
-                proposal_id = blockchain_result.get('proposal_id', 0)
-                park_zip = analysis_data.get('parkZip') or removal_analysis.get('parkZip')
-                if not park_zip and selected_park_id:
-                    from database import get_supabase
-                    supabase = get_supabase()
-                    try:
-                        park_response = supabase.table('parks').select('park_zip').eq('park_id', selected_park_id).execute()
-                        if park_response.data and len(park_response.data) > 0:
-                            park_zip = park_response.data[0].get('park_zip')
-                    except Exception as e:
-                        logger.error(f"Error fetching park zip: {e}")
-
-                if park_zip:
-                    users = await get_users_by_zip_code(park_zip)
-                    description = blockchain_result.get('email_summary',
-                        f"{park_name}: Environmental impact analysis shows significant changes to vegetation and air quality."
-                    )
-                    emails_sent = 0
-                    for user in users:
-                        try:
-                            email_sent = email_service.send_proposal_notification(
-                                recipient_email=user['email'],
-                                park_name=park_name,
-                                proposal_id=proposal_id,
-                                end_date=end_date,
-                                description=description
-                            )
-                            if email_sent:
-                                emails_sent += 1
-                        except Exception as e:
-                            logger.error(f"Failed to send email to {user['email']}: {e}")
-
-                    if emails_sent > 0:
-                        logger.info(f"Sent {emails_sent} email notifications to users in ZIP {park_zip} for proposal #{proposal_id}")
-                    else:
-                        logger.warning(f"No emails sent for proposal #{proposal_id} (ZIP: {park_zip}, {len(users)} users found)")
-                else:
-                    logger.warning(f"Could not determine park ZIP code, no emails sent for proposal #{proposal_id}")
-
-            except Exception as e:
-                logger.error(f"Error sending email notifications: {e}")
-                import traceback
-                traceback.print_exc()
+            _run_in_background(_notify_proposal_subscribers(
+                removal_analysis.get('parkZip') or analysis_data.get('parkZip'),
+                blockchain_result.get('proposal_id', 0),
+                park_name,
+                end_date,
+                blockchain_result.get('email_summary',
+                    f"{park_name}: Environmental impact analysis shows significant changes to vegetation and air quality."
+                )
+            ))
 
             reply = f"""Community proposal created for {park_name} with deadline {end_date}.
 
@@ -701,15 +956,6 @@ The proposal has been created locally and includes comprehensive environmental i
                 }
             }
 
-    except ImportError:
-        logger.warning("Blockchain module not available")
-        _cleanup_proposal_session(storage, session_id)
-        return {
-            "sessionId": session_id,
-            "action": "proposal_created",
-            "reply": f"Community proposal created for {park_name} with deadline {end_date}. The proposal includes comprehensive environmental impact analysis and is ready for community review.\n\n⚠️ Note: Blockchain integration not available - proposal created locally only.",
-            "data": proposal_data
-        }
     except Exception as e:
         logger.error(f"Blockchain integration error: {str(e)}")
         _cleanup_proposal_session(storage, session_id)
@@ -720,12 +966,22 @@ The proposal has been created locally and includes comprehensive environmental i
             "data": proposal_data
         }
 
+def _geometry_key(geometry, *extra):
+    """Stable hash of a GeoJSON geometry plus any extra request parameters"""
+    payload = json.dumps([geometry, *extra], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 async def handle_analyze_request(request: AnalyzeRequest):
     """Handle analyze endpoint requests"""
     try:
         geometry = request.geometry
         land_use_type = request.landUseType
 
+        cache_key = _geometry_key(geometry, "analyze", land_use_type)
+        cached = _GEOMETRY_RESULTS.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             park_geom = geometry_from_geojson(geometry)
             buffer_geom = park_geom.buffer(800)
@@ -733,23 +989,33 @@ async def handle_analyze_request(request: AnalyzeRequest):
             logger.error(f"Geometry error in analyze endpoint: {e}")
             raise HTTPException(status_code=400, detail=f"Invalid geometry: {str(e)}")
 
-        ndvi_before = compute_ndvi(buffer_geom)
-        walkability_before = compute_walkability(buffer_geom)
-        pm25_before = compute_pm25(buffer_geom)
-        affected_population = compute_population(buffer_geom)
-
-        if land_use_type == "removed":
-            buffer_after = buffer_geom.difference(park_geom)
-            ndvi_after = compute_ndvi(buffer_after)
-        elif land_use_type == "replaced_by_building":
-            ndvi_after = simulate_replacement_with_buildings(buffer_geom, park_geom)
-        else:
-            ndvi_after = ndvi_before
-
-        walkability_after = compute_walkability(buffer_geom.difference(park_geom))
-        pm25_after = compute_pm25(buffer_geom.difference(park_geom))
-
-        return {
+        buffer_after = buffer_geom.difference(park_geom)
+        ndvi_after_task = None
+
+        async with asyncio.TaskGroup() as tg:
+            ndvi_before_task = tg.create_task(asyncio.to_thread(compute_ndvi, buffer_geom))
+            walkability_before_task = tg.create_task(asyncio.to_thread(compute_walkability, buffer_geom))
+            pm25_before_task = tg.create_task(asyncio.to_thread(compute_pm25, buffer_geom))
+            population_task = tg.create_task(asyncio.to_thread(compute_population, buffer_geom))
+            walkability_after_task = tg.create_task(asyncio.to_thread(compute_walkability, buffer_after))
+            pm25_after_task = tg.create_task(asyncio.to_thread(compute_pm25, buffer_after))
+
+            if land_use_type == "removed":
+                ndvi_after_task = tg.create_task(asyncio.to_thread(compute_ndvi, buffer_after))
+            elif land_use_type == "replaced_by_building":
+                ndvi_after_task = tg.create_task(
+                    asyncio.to_thread(simulate_replacement_with_buildings, buffer_geom, park_geom)
+                )
+
+        ndvi_before = ndvi_before_task.result()
+        walkability_before = walkability_before_task.result()
+        pm25_before = pm25_before_task.result()
+        affected_population = population_task.result()
+        walkability_after = walkability_after_task.result()
+        pm25_after = pm25_after_task.result()
+        ndvi_after = ndvi_after_task.result() if ndvi_after_task else ndvi_before
+
+        result = {
             "affectedPopulation10MinWalk": int(affected_population),
             "ndviBefore": round(ndvi_before, 4) if ndvi_before else None,
             "ndviAfter": round(ndvi_after, 4) if ndvi_after else None,
@@ -758,25 +1024,37 @@ async def handle_analyze_request(request: AnalyzeRequest):
             "pm25Before": round(pm25_before, 2) if pm25_before else None,
             "pm25After": round(pm25_after, 2) if pm25_after else None
         }
+        _GEOMETRY_RESULTS[cache_key] = result
+        return result
 
-    except Exception as e:
+    except* HTTPException as eg:
+        raise eg.exceptions[0]
+    except* Exception as eg:
+        e = eg.exceptions[0]
         logger.error(f"Error in analyze endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 async def handle_ndvi_request(request: NDVIRequest):
     """Handle NDVI endpoint requests"""
     try:
+        cache_key = _geometry_key(request.geometry, "ndvi")
+        cached = _GEOMETRY_RESULTS.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             geometry = geometry_from_geojson(request.geometry)
         except ValueError as e:
             logger.error(f"Geometry error in NDVI endpoint: {e}")
             raise HTTPException(status_code=400, detail=f"Invalid geometry: {str(e)}")
 
-        ndvi_value = compute_ndvi(geometry)
+        ndvi_value = await asyncio.to_thread(compute_ndvi, geometry)
 
-        return {
+        result = {
             "ndvi": round(ndvi_value, 4) if ndvi_value is not None else None
         }
+        _GEOMETRY_RESULTS[cache_key] = result
+        return result
 
     except HTTPException:
         raise
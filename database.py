@@ -354,13 +354,14 @@ async def analyze_park_removal_impact(park_id: str, land_use_type: str = "remove
 
     supabase = get_supabase()
     try:
-        response = supabase.table('parks_stats').select('park_name, geom').eq('park_id', park_id).execute()
+        response = supabase.table('parks').select('park_name, park_zip, geom').eq('park_id', park_id).execute()
 
         if not response.data:
             return None
 
         row = response.data[0]
         park_name = row.get("park_name")
+        park_zip = row.get("park_zip")
         geometry = row.get("geom")
 
         stats = await get_park_statistics_by_id(park_id)
@@ -407,6 +408,7 @@ async def analyze_park_removal_impact(park_id: str, land_use_type: str = "remove
         return {
             "parkId": park_id,
             "parkName": park_name,
+            "parkZip": park_zip,
             "landUseType": land_use_type,
             "affectedPopulation10MinWalk": int(affected_population),
             "ndviBefore": round(ndvi_before, 4) if ndvi_before else None,
@@ -2,6 +2,19 @@ import express from 'express';
 
 export const contractRoutes = express.Router();
 
+// Batch routes accept at most BATCH_MAX_IDS proposals and run their contract
+// queries BATCH_CONCURRENCY at a time
+const BATCH_MAX_IDS = 100;
+const BATCH_CONCURRENCY = 10;
+
+async function mapInChunks(items, fn, size = BATCH_CONCURRENCY) {
+  const results = [];
+  for (let i = 0; i < items.length; i += size) {
+    results.push(...await Promise.all(items.slice(i, i + size).map(fn)));
+  }
+  return results;
+}
+
 /**
  * GET /api/contract/info
  * Get contract information
@@ -136,6 +149,44 @@ contractRoutes.get('/proposal/:id', async (req, res, next) => {
   }
 });
 
+/**
+ * POST /api/contract/proposals/batch
+ * Get details for several proposals in one request
+ */
+contractRoutes.post('/proposals/batch', async (req, res, next) => {
+  try {
+    const hederaService = req.app.locals.hederaService;
+    const { proposalIds } = req.body;
+
+    if (!Array.isArray(proposalIds)) {
+      return res.status(400).json({
+        success: false,
+        error: 'Missing required field: proposalIds'
+      });
+    }
+
+    if (proposalIds.length > BATCH_MAX_IDS) {
+      return res.status(400).json({
+        success: false,
+        error: `At most ${BATCH_MAX_IDS} proposalIds per request`
+      });
+    }
+
+    const ids = proposalIds.map((id) => parseInt(id)).filter((id) => !isNaN(id));
+    const results = await mapInChunks(ids, (id) => hederaService.getProposal(id).catch((error) => {
+      console.error(`Batch fetch of proposal ${id} failed:`, error.message);
+      return null;
+    }));
+
+    res.json({
+      success: true,
+      proposals: results.filter((result) => result?.success).map((result) => result.proposal)
+    });
+  } catch (error) {
+    next(error);
+  }
+});
+
 /**
  * GET /api/contract/proposals/active
  * Get all active proposals
@@ -202,6 +253,52 @@ contractRoutes.get('/has-voted/:proposalId/:address', async (req, res, next) =>
   }
 });
 
+/**
+ * POST /api/contract/has-voted-batch
+ * Check whether a user has voted on each of several proposals
+ */
+contractRoutes.post('/has-voted-batch', async (req, res, next) => {
+  try {
+    const hederaService = req.app.locals.hederaService;
+    const { user, proposalIds } = req.body;
+
+    if (!user || !Array.isArray(proposalIds)) {
+      return res.status(400).json({
+        success: false,
+        error: 'Missing required fields: user, proposalIds'
+      });
+    }
+
+    if (proposalIds.length > BATCH_MAX_IDS) {
+      return res.status(400).json({
+        success: false,
+        error: `At most ${BATCH_MAX_IDS} proposalIds per request`
+      });
+    }
+
+    const ids = proposalIds.map((id) => parseInt(id)).filter((id) => !isNaN(id));
+    const results = await mapInChunks(ids, (id) => hederaService.hasUserVoted(id, user).catch((error) => {
+      console.error(`Batch vote check of proposal ${id} failed:`, error.message);
+      return null;
+    }));
+
+    // Only IDs that resolved are returned; the caller re-checks the rest
+    const votes = {};
+    ids.forEach((id, i) => {
+      if (results[i]?.success) {
+        votes[id] = results[i].hasVoted;
+      }
+    });
+
+    res.json({
+      success: true,
+      votes
+    });
+  } catch (error) {
+    next(error);
+  }
+});
+
 /**
  * POST /api/contract/close-proposal
  * Close a proposal and finalize voting results
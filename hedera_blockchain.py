@@ -1,41 +1,181 @@
 import os
+import time
+import asyncio
 import httpx
+import orjson
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from functools import lru_cache
+from cachetools import LRUCache, TTLCache
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+_CONTRACT_INFO_TTL = 300
+_HEALTH_TTL = 5
+_GATEWAY_ERRORS = frozenset({502, 503, 504})
+# Must match BATCH_MAX_IDS in hedera-service/src/routes/contract-routes.js
+_BATCH_MAX_IDS = 100
+_SUMMARY_MAX_BYTES = 240
+_SECONDS_PER_DAY = 86400
+_THIRTY_DAYS = 30 * _SECONDS_PER_DAY
+# Contract values are fixed point with 8 decimals; vegetation loss is also a percentage
+_FIXED_SCALE = 1e8
+_NDVI_LOSS_SCALE = 100 * _FIXED_SCALE
+_ENV_FIELDS = ('ndviBefore', 'ndviAfter', 'pm25Before', 'pm25After', 'pm25IncreasePercent')
+_PROPOSAL_ENV_FIELDS = _ENV_FIELDS + ('vegetationLossPercent',)
+
+
+def _rounded(value: Any, ndigits: int) -> Any:
+    """Round numeric values for use in cache keys, passing anything else through"""
+    try:
+        return round(float(value), ndigits)
+    except (TypeError, ValueError):
+        return value
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the Hedera service while the circuit breaker is open"""
+
+
+class _CircuitBreaker:
+    """Stop calling the Hedera service for a while after repeated failures"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def check(self):
+        if self._opened_at is None:
+            return
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            raise CircuitOpenError("circuit_open")
+        # Half-open: let requests through, but a single failure reopens the circuit
+        self._opened_at = None
+        self._failures = self.failure_threshold - 1
+
+    def record_success(self):
+        self._failures = 0
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.failure_threshold and self._opened_at is None:
+            logger.warning(f"Hedera service failed {self._failures} times in a row, pausing calls for {self.recovery_timeout}s")
+            self._opened_at = time.monotonic()
+
 
 class HederaBlockchainService:
     def __init__(self):
         """Initialize Hedera blockchain service"""
         self.hedera_service_url = os.getenv('HEDERA_SERVICE_URL', 'http://localhost:5000')
         self.network = os.getenv('HEDERA_NETWORK', 'testnet')
-        self.timeout = httpx.Timeout(30.0, connect=10.0)
+        self._tx_url_tpl = f"https://hashscan.io/{self.network}/transaction/{{}}"
+        self._topic_url_tpl = f"https://hashscan.io/{self.network}/topic/{{}}"
+        self.timeout = _DEFAULT_TIMEOUT
+        self._http: Optional[httpx.AsyncClient] = None
+        self._request_limit = asyncio.Semaphore(32)
+        self._breaker = _CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+        self._vote_check_limit = asyncio.Semaphore(10)
+        # Votes are final on-chain, so a positive answer is safe to cache
+        self._voted = TTLCache(maxsize=4096, ttl=600)
+        self._contract_info: Optional[tuple] = None
+        self._connected: Optional[tuple] = None
+        self._summary_cache = LRUCache(maxsize=256)
+        self._genai_client = None
 
         logger.info(f"Hedera Service URL: {self.hedera_service_url}")
         logger.info(f"Network: {self.network}")
 
+    async def _client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.hedera_service_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                headers={"content-type": "application/json"}
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request to the Hedera service with bounded concurrency and a circuit breaker
+
+        Transport errors, timeouts included, and 502/503/504 responses count
+        as breaker failures. Any other response means the service is up.
+        """
+        self._breaker.check()
+        client = await self._client()
+        async with self._request_limit:
+            try:
+                response = await client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                self._breaker.record_failure()
+                raise
+
+        # The service answers 500 with a {success: false} body for bad input and
+        # contract reverts, so only gateway errors mean it is actually down
+        if response.status_code in _GATEWAY_ERRORS:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    async def _request(self, method: str, path: str, *, json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call the Hedera service and return its JSON body, or a failure dict on any error"""
+        try:
+            response = await self._send(
+                method,
+                path,
+                content=orjson.dumps(json) if json is not None else None
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+        except Exception as e:
+            logger.error(f"Hedera {method} {path} failed: {e}")
+            return {'success': False, 'error': str(e)}
+
+        if not result.get('success'):
+            return {'success': False, 'error': result.get('error', 'Unknown error')}
+        return result
+
     async def is_connected(self) -> bool:
-        """Check if Hedera service is accessible"""
+        """Check if Hedera service is accessible, reusing a recent result"""
+        if self._connected and time.monotonic() - self._connected[0] < _HEALTH_TTL:
+            return self._connected[1]
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.hedera_service_url}/health")
-                return response.status_code == 200
+            response = await self._send("GET", "/health")
+            connected = response.status_code == 200
         except Exception as e:
             logger.error(f"Hedera service connection failed: {e}")
-            return False
+            connected = False
+
+        self._connected = (time.monotonic(), connected)
+        return connected
 
     async def get_contract_info(self) -> Dict[str, Any]:
-        """Get contract information"""
+        """Get contract information, cached for a few minutes"""
+        if self._contract_info and time.monotonic() - self._contract_info[0] < _CONTRACT_INFO_TTL:
+            return self._contract_info[1]
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/info"
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._send(
+                "GET",
+                "/api/contract/info"
+            )
+            response.raise_for_status()
+            info = orjson.loads(response.content)
+            self._contract_info = (time.monotonic(), info)
+            return info
         except Exception as e:
             logger.error(f"Failed to get contract info: {e}")
             raise
@@ -43,37 +183,38 @@ class HederaBlockchainService:
     async def create_proposal_on_blockchain(self, proposal_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a proposal on Hedera blockchain"""
         try:
-            analysis_data = proposal_data['analysisData']
+            analysis_data = proposal_data.get('analysisData')
+            if not analysis_data:
+                return {'success': False, 'error': 'Missing analysis data'}
+
             end_date_str = proposal_data['endDate']
+            current_time = int(datetime.now().timestamp())
             try:
                 parsed_date = datetime.strptime(end_date_str, "%B %d, %Y")
+            except (TypeError, ValueError):
+                end_timestamp = current_time + _THIRTY_DAYS
+            else:
                 end_of_day = parsed_date.replace(hour=23, minute=59, second=59)
                 end_timestamp = int(end_of_day.timestamp())
-            except:
-                end_timestamp = int(datetime.now().timestamp() + 30 * 24 * 3600)
 
-            current_time = int(datetime.now().timestamp())
             buffer_time = 3600
 
             if end_timestamp <= current_time + buffer_time:
                 logger.warning(f"End date too close, adding 30 days + buffer")
-                end_timestamp = current_time + (30 * 24 * 3600) + buffer_time
+                end_timestamp = current_time + _THIRTY_DAYS + buffer_time
 
-            ndvi_before = max(0, int(float(analysis_data.get('ndviBefore', 0)) * 1e8))
-            ndvi_after = max(0, int(float(analysis_data.get('ndviAfter', 0)) * 1e8))
-            pm25_before = max(0, int(float(analysis_data.get('pm25Before', 0)) * 1e8))
-            pm25_after = max(0, int(float(analysis_data.get('pm25After', 0)) * 1e8))
-            pm25_increase = max(0, int(float(analysis_data.get('pm25IncreasePercent', 0)) * 1e8))
+            env_values = {field: float(analysis_data.get(field) or 0) for field in _ENV_FIELDS}
+            environmental_data = {field: max(0, int(value * _FIXED_SCALE)) for field, value in env_values.items()}
 
-            ndvi_before_val = float(analysis_data.get('ndviBefore', 0))
-            ndvi_after_val = float(analysis_data.get('ndviAfter', 0))
-            vegetation_loss = max(0, int((ndvi_before_val - ndvi_after_val) * 100 * 1e8)) if ndvi_before_val and ndvi_after_val else 0
+            ndvi_before_val = env_values['ndviBefore']
+            ndvi_after_val = env_values['ndviAfter']
+            environmental_data['vegetationLossPercent'] = max(0, int((ndvi_before_val - ndvi_after_val) * _NDVI_LOSS_SCALE)) if ndvi_before_val and ndvi_after_val else 0
 
-            demographics = analysis_data.get('demographics', {})
-            children = max(0, int(demographics.get('kids', 0)))
-            adults = max(0, int(demographics.get('adults', 0)))
-            seniors = max(0, int(demographics.get('seniors', 0)))
-            total_affected = max(0, int(analysis_data.get('affectedPopulation10MinWalk', 0)))
+            demographics = analysis_data.get('demographics') or {}
+            children = max(0, int(demographics.get('kids') or 0))
+            adults = max(0, int(demographics.get('adults') or 0))
+            seniors = max(0, int(demographics.get('seniors') or 0))
+            total_affected = max(0, int(analysis_data.get('affectedPopulation10MinWalk') or 0))
 
             description = proposal_data.get('frontendDescription',
                 f"This park provides green space for the community. Its removal would impact air quality and vegetation health."
@@ -93,14 +234,7 @@ class HederaBlockchainService:
                 "parkId": proposal_data['parkId'],
                 "description": description,
                 "endDate": end_timestamp,
-                "environmentalData": {
-                    "ndviBefore": ndvi_before,
-                    "ndviAfter": ndvi_after,
-                    "pm25Before": pm25_before,
-                    "pm25After": pm25_after,
-                    "pm25IncreasePercent": pm25_increase,
-                    "vegetationLossPercent": vegetation_loss
-                },
+                "environmentalData": environmental_data,
                 "demographics": {
                     "children": children,
                     "adults": adults,
@@ -112,13 +246,13 @@ class HederaBlockchainService:
                 "fundingGoal": funding_goal
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/create-proposal",
-                    json=hedera_payload
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await self._send(
+                "POST",
+                "/api/contract/create-proposal",
+                content=orjson.dumps(hedera_payload)
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
             if result.get('success'):
                 return {
@@ -126,7 +260,7 @@ class HederaBlockchainService:
                     'proposal_id': result.get('proposalId', result.get('proposal_id', 0)),
                     'transaction_hash': result.get('transactionId'),
                     'status': result.get('status'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}",
+                    'explorer_url': self._tx_url_tpl.format(result.get('transactionId')),
                     'email_summary': blockchain_summary
                 }
             else:
@@ -136,24 +270,22 @@ class HederaBlockchainService:
                 }
 
         except Exception as e:
-            logger.error(f"Failed to create proposal: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to create proposal")
             return {'success': False, 'error': str(e)}
 
     async def get_proposal(self, proposal_id: int) -> Optional[Dict[str, Any]]:
         """Get proposal from blockchain"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/proposal/{proposal_id}"
-                )
+            response = await self._send(
+                "GET",
+                f"/api/contract/proposal/{proposal_id}"
+            )
 
-                if response.status_code == 404:
-                    return None
+            if response.status_code == 404:
+                return None
 
-                response.raise_for_status()
-                result = response.json()
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
             if result.get('success'):
                 return self._parse_hedera_proposal(result.get('proposal'))
@@ -167,117 +299,176 @@ class HederaBlockchainService:
             logger.error(f"Failed to get proposal {proposal_id}: {e}")
             return None
 
-    async def get_all_active_proposals(self) -> List[int]:
-        """Get all active proposal IDs"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/proposals/active"
-                )
-                response.raise_for_status()
-                result = response.json()
+    async def fetch_proposals(self, proposal_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get several proposals concurrently, skipping any that are missing"""
+        proposals = await asyncio.gather(*(self.get_proposal(pid) for pid in proposal_ids))
+        return [proposal for proposal in proposals if proposal]
 
-            if result.get('success'):
-                return result.get('proposalIds', [])
+    async def get_proposals_batch(self, proposal_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get several proposals in one request, falling back to per-ID lookups"""
+        if not proposal_ids:
             return []
 
+        if len(proposal_ids) > _BATCH_MAX_IDS:
+            proposals = []
+            for start in range(0, len(proposal_ids), _BATCH_MAX_IDS):
+                proposals += await self.get_proposals_batch(proposal_ids[start:start + _BATCH_MAX_IDS])
+            return proposals
+
+        try:
+            response = await self._send(
+                "POST",
+                "/api/contract/proposals/batch",
+                content=orjson.dumps({"proposalIds": proposal_ids})
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+            if not result.get('success'):
+                raise ValueError(result.get('error', 'Unknown error'))
         except Exception as e:
-            logger.error(f"Failed to get active proposals: {e}")
-            return []
+            logger.warning(f"Batch proposal fetch unavailable, fetching individually: {e}")
+            return await self.fetch_proposals(proposal_ids)
 
-    async def get_all_accepted_proposals(self) -> List[int]:
-        """Get all accepted proposal IDs"""
+        return [self._parse_hedera_proposal(proposal) for proposal in result.get('proposals', []) if proposal]
+
+    async def _get_proposal_ids(self, status: str) -> List[int]:
+        """Get proposal IDs with the given status (active, accepted or rejected)"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/proposals/accepted"
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await self._send("GET", f"/api/contract/proposals/{status}")
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
             if result.get('success'):
                 return result.get('proposalIds', [])
             return []
 
         except Exception as e:
-            logger.error(f"Failed to get accepted proposals: {e}")
+            logger.error(f"Failed to get {status} proposals: {e}")
             return []
 
-    async def get_all_rejected_proposals(self) -> List[int]:
-        """Get all rejected proposal IDs"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/proposals/rejected"
-                )
-                response.raise_for_status()
-                result = response.json()
+    async def get_all_proposals_by_status(self) -> Dict[str, List[int]]:
+        """Get active, accepted and rejected proposal IDs concurrently"""
+        statuses = ("active", "accepted", "rejected")
+        results = await asyncio.gather(*(self._get_proposal_ids(status) for status in statuses))
+        return dict(zip(statuses, results))
 
-            if result.get('success'):
-                return result.get('proposalIds', [])
-            return []
+    async def get_all_active_proposals(self) -> List[int]:
+        """Get all active proposal IDs"""
+        return await self._get_proposal_ids("active")
 
-        except Exception as e:
-            logger.error(f"Failed to get rejected proposals: {e}")
-            return []
+    async def get_all_accepted_proposals(self) -> List[int]:
+        """Get all accepted proposal IDs"""
+        return await self._get_proposal_ids("accepted")
+
+    async def get_all_rejected_proposals(self) -> List[int]:
+        """Get all rejected proposal IDs"""
+        return await self._get_proposal_ids("rejected")
 
     async def has_user_voted(self, proposal_id: int, user_address: str) -> bool:
         """Check if user has voted"""
+        if (user_address, proposal_id) in self._voted:
+            return True
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/has-voted/{proposal_id}/{user_address}"
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await self._send(
+                "GET",
+                f"/api/contract/has-voted/{proposal_id}/{user_address}"
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
             if result.get('success'):
-                return result.get('hasVoted', False)
+                has_voted = result.get('hasVoted', False)
+                if has_voted:
+                    self._voted[(user_address, proposal_id)] = True
+                return has_voted
             return False
 
         except Exception as e:
             logger.error(f"Failed to check if user voted: {e}")
             return False
 
-    async def submit_vote(self, proposal_id: int, vote: bool, voter_address: str) -> Dict[str, Any]:
-        """Submit a vote"""
-        try:
-            payload = {
-                "proposalId": proposal_id,
-                "vote": vote,
-                "voter": voter_address
-            }
+    async def has_user_voted_many(self, proposal_ids: List[int], user_address: str) -> Dict[int, bool]:
+        """Check whether a user has voted on each of several proposals"""
+        votes = {pid: True for pid in proposal_ids if (user_address, pid) in self._voted}
+        pending = [pid for pid in proposal_ids if pid not in votes]
+        if not pending:
+            return votes
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/vote",
-                    json=payload
+        batch = {}
+        try:
+            for start in range(0, len(pending), _BATCH_MAX_IDS):
+                response = await self._send(
+                    "POST",
+                    "/api/contract/has-voted-batch",
+                    content=orjson.dumps({"user": user_address, "proposalIds": pending[start:start + _BATCH_MAX_IDS]})
                 )
                 response.raise_for_status()
-                result = response.json()
+                result = orjson.loads(response.content)
+                if not result.get('success'):
+                    raise ValueError(result.get('error', 'Unknown error'))
+                batch.update((int(pid), bool(voted)) for pid, voted in result.get('votes', {}).items())
+        except Exception as e:
+            logger.warning(f"Batch vote check unavailable, checking individually: {e}")
 
-            if result.get('success'):
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}"
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result.get('error', 'Unknown error')
-                }
+        # The batch route leaves out IDs whose query failed
+        missing = [pid for pid in pending if pid not in batch]
+        if missing:
+            async def check(pid):
+                async with self._vote_check_limit:
+                    return await self.has_user_voted(pid, user_address)
 
-        except Exception as e:
-            logger.error(f"Failed to submit vote: {e}")
-            return {'success': False, 'error': str(e)}
+            results = await asyncio.gather(*(check(pid) for pid in missing))
+            batch.update(zip(missing, results))
+
+        for pid in pending:
+            voted = batch.get(pid, False)
+            if voted:
+                self._voted[(user_address, pid)] = True
+            votes[pid] = voted
+        return votes
+
+    async def submit_vote(self, proposal_id: int, vote: bool, voter_address: str) -> Dict[str, Any]:
+        """Submit a vote"""
+        result = await self._request("POST", "/api/contract/vote", json={
+            "proposalId": proposal_id,
+            "vote": vote,
+            "voter": voter_address
+        })
+        if not result.get('success'):
+            return result
+
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'explorer_url': self._tx_url_tpl.format(result.get('transactionId'))
+        }
+
+    def _gemini(self):
+        """Return the shared Gemini client, creating it on first use"""
+        if self._genai_client is None:
+            from google import genai
+            self._genai_client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        return self._genai_client
 
     async def _generate_blockchain_summary(self, full_summary: str, analysis_data: Dict) -> str:
         """Generate a concise summary for blockchain storage"""
-        try:
-            from google import genai
+        if not (analysis_data.get('ndviBefore') or analysis_data.get('ndviAfter')
+                or analysis_data.get('pm25IncreasePercent')):
+            return self._fallback_summary(analysis_data)
+
+        key = (
+            analysis_data.get('parkName'),
+            _rounded(analysis_data.get('ndviBefore'), 4),
+            _rounded(analysis_data.get('ndviAfter'), 4),
+            _rounded(analysis_data.get('pm25IncreasePercent'), 2)
+        )
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
 
-            client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        try:
+            client = self._gemini()
 
             prompt = f"""Create a neutral data summary for a park proposal focusing only on NDVI and PM2.5 metrics.
 
@@ -295,7 +486,8 @@ Requirements:
 
 Return only the factual summary."""
 
-            response = client.models.generate_content(
+            response = await asyncio.to_thread(
+                client.models.generate_content,
                 model="gemini-2.0-flash-exp",
                 contents=prompt
             )
@@ -304,19 +496,26 @@ Return only the factual summary."""
 
             if len(summary) < 230:
                 summary += " Environmental impact assessment indicates significant changes."
-            elif len(summary) > 240:
-                summary = summary[:240]
 
+            encoded = summary.encode('utf-8')
+            if len(encoded) > _SUMMARY_MAX_BYTES:
+                summary = encoded[:_SUMMARY_MAX_BYTES].decode('utf-8', 'ignore')
+
+            self._summary_cache[key] = summary
             return summary
 
         except Exception as e:
             logger.warning(f"Failed to generate summary: {e}")
-            park_name = analysis_data.get('parkName', 'Park')
-            ndvi_before = analysis_data.get('ndviBefore', 0)
-            ndvi_after = analysis_data.get('ndviAfter', 0)
-            pm25_increase = analysis_data.get('pm25IncreasePercent', 0)
+            return self._fallback_summary(analysis_data)
+
+    def _fallback_summary(self, analysis_data: Dict) -> str:
+        """Deterministic one-line summary used when Gemini is skipped or fails"""
+        park_name = analysis_data.get('parkName', 'Park')
+        ndvi_before = analysis_data.get('ndviBefore', 0)
+        ndvi_after = analysis_data.get('ndviAfter', 0)
+        pm25_increase = analysis_data.get('pm25IncreasePercent', 0)
 
-            return f"{park_name}: NDVI {ndvi_before}→{ndvi_after}, PM2.5 +{pm25_increase}%"
+        return f"{park_name}: NDVI {ndvi_before}→{ndvi_after}, PM2.5 +{pm25_increase}%"
 
     def _parse_hedera_proposal(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
         """Parse proposal from Hedera service format"""
@@ -325,12 +524,8 @@ Return only the factual summary."""
 
         env_data = proposal.get('environmentalData', {})
         environmental_data = {
-            'ndviBefore': float(env_data.get('ndviBefore', 0)) / 1e8,
-            'ndviAfter': float(env_data.get('ndviAfter', 0)) / 1e8,
-            'pm25Before': float(env_data.get('pm25Before', 0)) / 1e8,
-            'pm25After': float(env_data.get('pm25After', 0)) / 1e8,
-            'pm25IncreasePercent': float(env_data.get('pm25IncreasePercent', 0)) / 1e8,
-            'vegetationLossPercent': float(env_data.get('vegetationLossPercent', 0)) / 1e8,
+            field: float(env_data.get(field, 0)) / _FIXED_SCALE
+            for field in _PROPOSAL_ENV_FIELDS
         }
 
         demographics = proposal.get('demographics', {})
@@ -354,249 +549,145 @@ Return only the factual summary."""
 
     async def create_chat_topic(self, session_id: str) -> Dict[str, Any]:
         """Create HCS topic for chat session"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/hcs/create-topic",
-                    json={"memo": f"ParkPulse Chat Session {session_id}"}
-                )
-                response.raise_for_status()
-                result = response.json()
+        result = await self._request("POST", "/api/hcs/create-topic", json={
+            "memo": f"ParkPulse Chat Session {session_id}"
+        })
+        if not result.get('success'):
+            return result
 
-            if result.get('success'):
-                logger.info(f"Created HCS topic {result.get('topicId')} for session {session_id}")
-                return {
-                    'success': True,
-                    'topic_id': result.get('topicId'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/topic/{result.get('topicId')}"
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result.get('error', 'Unknown error')
-                }
-        except Exception as e:
-            logger.error(f"Failed to create chat topic: {e}")
-            return {'success': False, 'error': str(e)}
+        logger.info(f"Created HCS topic {result.get('topicId')} for session {session_id}")
+        return {
+            'success': True,
+            'topic_id': result.get('topicId'),
+            'explorer_url': self._topic_url_tpl.format(result.get('topicId'))
+        }
 
     async def submit_chat_message(self, topic_id: str, role: str, message: str) -> Dict[str, Any]:
         """Submit chat message to HCS topic with User: or Agent: prefix"""
-        try:
-            formatted_message = f"{role}:{message}"
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/hcs/submit",
-                    json={
-                        "topicId": topic_id,
-                        "message": formatted_message,
-                        "timestamp": datetime.now().isoformat(),
-                        "sessionId": topic_id
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-
-            if result.get('success'):
-                logger.debug(f"Logged to HCS: {role}:{message[:50]}...")
-                return {
-                    'success': True,
-                    'transaction_id': result.get('transactionId')
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result.get('error', 'Unknown error')
-                }
-        except Exception as e:
-            logger.warning(f"Failed to submit chat message to HCS: {e}")
-            return {'success': False, 'error': str(e)}
+        result = await self._request("POST", "/api/hcs/submit", json={
+            "topicId": topic_id,
+            "message": f"{role}:{message}",
+            "timestamp": datetime.now().isoformat(),
+            "sessionId": topic_id
+        })
+        if not result.get('success'):
+            return result
+
+        logger.debug(f"Logged to HCS: {role}:{message[:50]}...")
+        return {
+            'success': True,
+            'transaction_id': result.get('transactionId')
+        }
 
     async def close_proposal(self, proposal_id: int) -> Dict[str, Any]:
         """Close a proposal and finalize voting results"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/close-proposal",
-                    json={"proposalId": proposal_id}
-                )
-                response.raise_for_status()
-                result = response.json()
+        result = await self._request("POST", "/api/contract/close-proposal", json={"proposalId": proposal_id})
+        if not result.get('success'):
+            return result
 
-            if result.get('success'):
-                logger.info(f"Closed proposal #{proposal_id}")
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'status': result.get('status'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}"
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to close proposal: {e}")
-            return {'success': False, 'error': str(e)}
+        logger.info(f"Closed proposal #{proposal_id}")
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'status': result.get('status'),
+            'explorer_url': self._tx_url_tpl.format(result.get('transactionId'))
+        }
 
     async def set_funding_goal(self, proposal_id: int, goal_hbar: float) -> Dict[str, Any]:
         """Set funding goal for an accepted proposal"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/set-funding-goal",
-                    json={
-                        "proposalId": proposal_id,
-                        "goal": goal_hbar
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-
-            if result.get('success'):
-                logger.info(f"Set funding goal for proposal #{proposal_id}: {goal_hbar} HBAR")
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'goal': goal_hbar
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to set funding goal: {e}")
-            return {'success': False, 'error': str(e)}
+        result = await self._request("POST", "/api/contract/set-funding-goal", json={
+            "proposalId": proposal_id,
+            "goal": goal_hbar
+        })
+        if not result.get('success'):
+            return result
+
+        logger.info(f"Set funding goal for proposal #{proposal_id}: {goal_hbar} HBAR")
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'goal': goal_hbar
+        }
 
     async def donate_to_proposal(self, proposal_id: int, amount_hbar: float) -> Dict[str, Any]:
         """Donate HBAR to an accepted proposal"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/donate",
-                    json={
-                        "proposalId": proposal_id,
-                        "amount": amount_hbar
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-
-            if result.get('success'):
-                logger.info(f"Donated {amount_hbar} HBAR to proposal #{proposal_id}")
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'amount': amount_hbar,
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}"
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to donate: {e}")
-            return {'success': False, 'error': str(e)}
+        result = await self._request("POST", "/api/contract/donate", json={
+            "proposalId": proposal_id,
+            "amount": amount_hbar
+        })
+        if not result.get('success'):
+            return result
+
+        logger.info(f"Donated {amount_hbar} HBAR to proposal #{proposal_id}")
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'amount': amount_hbar,
+            'explorer_url': self._tx_url_tpl.format(result.get('transactionId'))
+        }
 
     async def get_donation_progress(self, proposal_id: int) -> Dict[str, Any]:
         """Get fundraising progress for a proposal"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/contract/donation-progress/{proposal_id}"
-                )
-                response.raise_for_status()
-                result = response.json()
+        result = await self._request("GET", f"/api/contract/donation-progress/{proposal_id}")
+        if not result.get('success'):
+            return result
 
-            if result.get('success'):
-                return {
-                    'success': True,
-                    'raised': result.get('raised', 0),
-                    'goal': result.get('goal', 0),
-                    'percentage': result.get('percentage', 0)
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to get donation progress: {e}")
-            return {'success': False, 'error': str(e)}
+        return {
+            'success': True,
+            'raised': result.get('raised', 0),
+            'goal': result.get('goal', 0),
+            'percentage': result.get('percentage', 0)
+        }
 
     async def withdraw_funds(self, proposal_id: int, recipient_address: str) -> Dict[str, Any]:
         """Withdraw funds from a proposal (owner only)"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/withdraw-funds",
-                    json={
-                        "proposalId": proposal_id,
-                        "recipient": recipient_address
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-
-            if result.get('success'):
-                logger.info(f"Withdrew funds from proposal #{proposal_id}")
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}"
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to withdraw funds: {e}")
-            return {'success': False, 'error': str(e)}
+        result = await self._request("POST", "/api/contract/withdraw-funds", json={
+            "proposalId": proposal_id,
+            "recipient": recipient_address
+        })
+        if not result.get('success'):
+            return result
+
+        logger.info(f"Withdrew funds from proposal #{proposal_id}")
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'explorer_url': self._tx_url_tpl.format(result.get('transactionId'))
+        }
 
     async def send_park_tokens(self, recipient_account_id: str) -> Dict[str, Any]:
         """Send 5 PARK tokens to a recipient account"""
-        try:
-            payload = {
-                "recipientAccountId": recipient_account_id
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.hedera_service_url}/api/contract/send-park-tokens",
-                    json=payload
-                )
-                response.raise_for_status()
-                result = response.json()
+        result = await self._request("POST", "/api/contract/send-park-tokens", json={
+            "recipientAccountId": recipient_account_id
+        })
+        if not result.get('success'):
+            return result
 
-            if result.get('success'):
-                logger.info(f"Successfully sent 5 PARK tokens to {recipient_account_id}. TX: {result.get('transactionId')}")
-                return {
-                    'success': True,
-                    'transaction_hash': result.get('transactionId'),
-                    'explorer_url': f"https://hashscan.io/{self.network}/transaction/{result.get('transactionId')}"
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result.get('error', 'Unknown error')
-                }
-
-        except Exception as e:
-            logger.error(f"Failed to send PARK tokens: {e}")
-            return {'success': False, 'error': str(e)}
+        logger.info(f"Successfully sent 5 PARK tokens to {recipient_account_id}. TX: {result.get('transactionId')}")
+        return {
+            'success': True,
+            'transaction_hash': result.get('transactionId'),
+            'explorer_url': self._tx_url_tpl.format(result.get('transactionId'))
+        }
 
     async def get_user_balances(self, account_id: str) -> Dict[str, Any]:
         """Get user token balances (HBAR, USDC, PARK)"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.hedera_service_url}/api/balances/{account_id}"
-                )
-                response.raise_for_status()
-                result = response.json()
+        result = await self._request("GET", f"/api/balances/{account_id}")
+        if not result.get('success'):
+            return result
 
-            if result.get('success'):
-                return {
-                    'success': True,
-                    'balances': result.get('balances', {
-                        'hbar': 0,
-                        'usdc': 0,
-                        'park': 0
-                    })
-                }
-            else:
-                return {'success': False, 'error': result.get('error', 'Unknown error')}
-        except Exception as e:
-            logger.error(f"Failed to get user balances: {e}")
-            return {'success': False, 'error': str(e)}
+        return {
+            'success': True,
+            'balances': result.get('balances', {
+                'hbar': 0,
+                'usdc': 0,
+                'park': 0
+            })
+        }
 
 BlockchainService = HederaBlockchainService
+
+@lru_cache(maxsize=1)
+def get_blockchain_service() -> HederaBlockchainService:
+    """Process-wide Hedera service shared by the API routes and the agent"""
+    return HederaBlockchainService()
@@ -4,10 +4,12 @@ import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from contextlib import asynccontextmanager
-import asyncpg
+from itertools import chain
+from cachetools import TTLCache
 import ee
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from google import genai
 from google.genai import types
@@ -21,7 +23,7 @@ from database import (
     get_park_information, get_park_air_quality, analyze_park_removal_impact,
     analyze_park_removal_pollution_impact
 )
-from hedera_blockchain import HederaBlockchainService as BlockchainService
+from hedera_blockchain import get_blockchain_service
 from models import (
     AgentRequest, LocationQuery, AnalyzeRequest, NDVIRequest,
     Intent, LocationType, Unit, LandUseType, IntentClassification,
@@ -33,39 +35,69 @@ from utils import (
     compute_population, simulate_replacement_with_buildings,
     get_health_risk_category, get_environmental_damage_level
 )
-from agent import handle_agent_request, handle_analyze_request, handle_ndvi_request
+from agent import handle_agent_request, handle_analyze_request, handle_ndvi_request, shutdown_background_tasks
 
 load_dotenv()
 
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
-session_storage: Dict[str, Dict[str, Any]] = {}
+# Agent chat sessions; idle sessions expire after an hour
+session_storage: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
 
 gee_project_id = os.getenv('GEE_PROJECT_ID')
-ee.Initialize(project=gee_project_id)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def initialize_earth_engine(attempts: int = 3):
+    """Initialize Earth Engine off the event loop, retrying transient failures"""
+    for attempt in range(1, attempts + 1):
+        try:
+            await asyncio.to_thread(ee.Initialize, project=gee_project_id)
+            logger.info("Earth Engine initialized")
+            return
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            logger.warning("Earth Engine initialization failed (attempt %s/%s): %s", attempt, attempts, e)
+            await asyncio.sleep(2 ** attempt)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await initialize_earth_engine()
     await init_db()
     logger.info("Database connection pool initialized")
+    app.state.blockchain = get_blockchain_service()
+    try:
+        await asyncio.to_thread(client.models.list, config={"page_size": 1})
+        logger.info("Gemini API connection warmed up")
+    except Exception as e:
+        logger.warning("Gemini warmup failed: %s", e)
     yield
+    await shutdown_background_tasks()
+    await app.state.blockchain.aclose()
     await close_db()
 
 app = FastAPI(
     title="ParkPulse.ai API",
     description="Urban planning and GIS-aware API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+cors_origins = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", os.getenv("APP_URL", "http://localhost:3000")).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
@@ -75,7 +107,7 @@ try:
     client = genai.Client(api_key=gemini_api_key)
     logger.info("Gemini API client initialized successfully")
 except Exception as e:
-    logger.error(f"Failed to initialize Gemini API client: {e}")
+    logger.error("Failed to initialize Gemini API client: %s", e)
     raise e
 
 
@@ -119,58 +151,50 @@ async def health_check():
 async def get_parks_by_zipcode(zipcode: str):
     """Get parks by zipcode"""
     try:
-        logger.info(f"GET /api/parks/{zipcode} - Fetching parks for zipcode")
-        query = LocationQuery(zip=zipcode)
+        logger.info("GET /api/parks/%s - Fetching parks for zipcode", zipcode)
+        # The path parameter is already a validated str, so skip re-validating it
+        query = LocationQuery.model_construct(zip=zipcode)
 
         feature_collection = await query_parks_by_location(query)
-
-        if not feature_collection or not feature_collection.get('features'):
-            return {
-                "success": False,
-                "error": f"No parks found for zipcode {zipcode}"
-            }
-
-        return {
-            "success": True,
-            "featureCollection": feature_collection,
-            "count": len(feature_collection.get('features', []))
-        }
-
     except Exception as e:
-        logger.error(f"Error fetching parks for zipcode {zipcode}: {e}")
+        logger.error("Error fetching parks for zipcode %s: %s", zipcode, e)
         return {"success": False, "error": str(e)}
 
+    if not feature_collection or not feature_collection.get('features'):
+        raise HTTPException(status_code=404, detail=f"No parks found for zipcode {zipcode}")
+
+    # The default ORJSONResponse encodes the whole collection in one call
+    return {
+        "success": True,
+        "featureCollection": feature_collection,
+        "count": len(feature_collection["features"])
+    }
+
 @app.get("/api/proposals")
-async def get_proposals():
-    """Get all proposals (active, accepted, rejected) from Hedera blockchain"""
+async def get_proposals(request: Request, walletAddress: Optional[str] = None):
+    """Get all proposals (active, accepted, rejected) from Hedera blockchain
+
+    When walletAddress is given, each proposal also carries hasVoted for that wallet.
+    """
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
 
-        if not await blockchain_service.is_connected():
+        connected, ids_by_status = await asyncio.gather(
+            blockchain_service.is_connected(),
+            blockchain_service.get_all_proposals_by_status()
+        )
+        if not connected:
             return {"success": False, "error": "Hedera blockchain not connected"}
 
-        import asyncio
-        active_ids_task = blockchain_service.get_all_active_proposals()
-        accepted_ids_task = blockchain_service.get_all_accepted_proposals()
-        rejected_ids_task = blockchain_service.get_all_rejected_proposals()
+        all_proposal_ids = list(dict.fromkeys(chain.from_iterable(ids_by_status.values())))
 
-        active_ids, accepted_ids, rejected_ids = await asyncio.gather(
-            active_ids_task,
-            accepted_ids_task,
-            rejected_ids_task
-        )
+        proposals = await blockchain_service.get_proposals_batch(all_proposal_ids)
 
-        all_proposal_ids = list(set(active_ids + accepted_ids + rejected_ids))
-
-        proposals = []
-        for proposal_id in all_proposal_ids:
-            try:
-                proposal_data = await blockchain_service.get_proposal(proposal_id)
-                if proposal_data:
-                    proposals.append(proposal_data)
-            except Exception as e:
-                logger.error(f"Error fetching proposal {proposal_id}: {e}")
-                continue
+        if walletAddress:
+            votes = await blockchain_service.has_user_voted_many(
+                [p["id"] for p in proposals], walletAddress
+            )
+            proposals = [{**p, "hasVoted": votes.get(p["id"], False)} for p in proposals]
 
         return {
             "success": True,
@@ -179,37 +203,42 @@ async def get_proposals():
         }
 
     except Exception as e:
-        logger.error(f"Error fetching proposals: {e}")
+        logger.error("Error fetching proposals: %s", e)
         return {"success": False, "error": str(e)}
 
 @app.get("/api/proposals/{proposal_id}")
-async def get_proposal_details(proposal_id: int):
+async def get_proposal_details(proposal_id: int, request: Request):
     """Get detailed information for a specific proposal from Hedera blockchain"""
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
+        # Start the read right away so it overlaps with the health check
+        proposal_task = asyncio.create_task(blockchain_service.get_proposal(proposal_id))
 
         if not await blockchain_service.is_connected():
+            proposal_task.cancel()
             return {"success": False, "error": "Hedera blockchain not connected"}
 
-        proposal = await blockchain_service.get_proposal(proposal_id)
+        proposal = await proposal_task
 
         if not proposal:
-            return {"success": False, "error": "Proposal not found"}
+            raise HTTPException(status_code=404, detail="Proposal not found")
 
         return {
             "success": True,
             "proposal": proposal
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching proposal {proposal_id}: {e}")
+        logger.error("Error fetching proposal %s: %s", proposal_id, e)
         return {"success": False, "error": str(e)}
 
 @app.get("/api/contract-info")
-async def get_contract_info():
+async def get_contract_info(request: Request):
     """Get Hedera contract info for frontend integration"""
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
         contract_info = await blockchain_service.get_contract_info()
 
         return {
@@ -222,14 +251,14 @@ async def get_contract_info():
         }
 
     except Exception as e:
-        logger.error(f"Error getting contract info: {e}")
+        logger.error("Error getting contract info: %s", e)
         return {"success": False, "error": str(e)}
 
 @app.post("/api/create-proposal")
-async def create_proposal(proposal_data: dict):
+async def create_proposal(proposal_data: dict, request: Request):
     """Create a new proposal on Hedera blockchain"""
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
 
         if not await blockchain_service.is_connected():
             return {"success": False, "error": "Hedera blockchain not connected"}
@@ -237,45 +266,53 @@ async def create_proposal(proposal_data: dict):
         return result
 
     except Exception as e:
-        logger.error(f"Error creating proposal: {e}")
+        logger.error("Error creating proposal: %s", e)
         return {"success": False, "error": str(e)}
 
 class SendTokensRequest(BaseModel):
     recipientAccountId: str
 
 @app.post("/api/send-park-tokens")
-async def send_park_tokens_endpoint(request: SendTokensRequest):
+async def send_park_tokens_endpoint(body: SendTokensRequest, request: Request):
     """Send PARK tokens to a user account"""
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
 
         if not await blockchain_service.is_connected():
             return {"success": False, "error": "Hedera blockchain not connected"}
         
-        result = await blockchain_service.send_park_tokens(request.recipientAccountId)
+        result = await blockchain_service.send_park_tokens(body.recipientAccountId)
         return result
 
     except Exception as e:
-        logger.error(f"Error sending PARK tokens: {e}")
+        logger.error("Error sending PARK tokens: %s", e)
         return {"success": False, "error": str(e)}
 
 @app.get("/api/user-balances")
-async def get_user_balances(accountId: str):
+async def get_user_balances(accountId: str, request: Request):
     """Get user token balances (HBAR, USDC, PARK)"""
     try:
-        blockchain_service = BlockchainService()
+        blockchain_service = request.app.state.blockchain
+        balances_task = asyncio.create_task(blockchain_service.get_user_balances(accountId))
 
         if not await blockchain_service.is_connected():
+            balances_task.cancel()
             return {"success": False, "error": "Hedera blockchain not connected"}
 
-        # Get balances from Hedera service
-        result = await blockchain_service.get_user_balances(accountId)
-        return result
+        return await balances_task
 
     except Exception as e:
-        logger.error(f"Error getting user balances for {accountId}: {e}")
+        logger.error("Error getting user balances for %s: %s", accountId, e)
         return {"success": False, "error": str(e)}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=int(os.getenv("PORT", 4000)), reload=True)
\ No newline at end of file
+    reload = os.getenv("ENV") == "dev"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 4000)),
+        # Chat sessions live in process memory, so keep one worker unless told otherwise
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", 1)),
+        reload=reload
+    )
\ No newline at end of file
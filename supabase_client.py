@@ -1,6 +1,8 @@
 """Supabase client for user authentication and authorization"""
 import os
+import asyncio
 import logging
+from cachetools import TTLCache
 from supabase import create_client, Client
 
 logger = logging.getLogger(__name__)
@@ -16,9 +18,12 @@ else:
         supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
         logger.info("Supabase client initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize Supabase client: {e}")
+        logger.error("Failed to initialize Supabase client: %s", e)
         supabase = None
 
+# Successful authorization lookups, reused for a minute per wallet
+_auth_cache = TTLCache(maxsize=4096, ttl=60)
+
 
 async def check_user_authorization(wallet_address: str) -> dict:
     if not supabase:
@@ -35,26 +40,34 @@ async def check_user_authorization(wallet_address: str) -> dict:
             "error": "Wallet address required"
         }
 
+    cached = _auth_cache.get(wallet_address)
+    if cached is not None:
+        return cached
+
     try:
-        response = supabase.table('hedera_users') \
-            .select('wallet_address, name, email, is_government_employee') \
-            .eq('wallet_address', wallet_address) \
-            .single() \
-            .execute()
+        response = await asyncio.to_thread(
+            supabase.table('hedera_users')
+            .select('wallet_address, name, email, is_government_employee')
+            .eq('wallet_address', wallet_address)
+            .single()
+            .execute
+        )
 
         if response.data:
             user = response.data
             is_authorized = user.get('is_government_employee', False) is True
 
-            logger.info(f"Authorization check for {wallet_address}: {is_authorized}")
+            logger.info("Authorization check for %s: %s", wallet_address, is_authorized)
 
-            return {
+            result = {
                 "authorized": is_authorized,
                 "user": user,
                 "error": None
             }
+            _auth_cache[wallet_address] = result
+            return result
         else:
-            logger.warning(f"User not found: {wallet_address}")
+            logger.warning("User not found: %s", wallet_address)
             return {
                 "authorized": False,
                 "user": None,
@@ -62,7 +75,7 @@ async def check_user_authorization(wallet_address: str) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error checking authorization for {wallet_address}: {e}")
+        logger.error("Error checking authorization for %s: %s", wallet_address, e)
         return {
             "authorized": False,
             "user": None,
@@ -75,14 +88,16 @@ async def get_user_profile(wallet_address: str) -> dict:
         return None
 
     try:
-        response = supabase.table('hedera_users') \
-            .select('*') \
-            .eq('wallet_address', wallet_address) \
-            .single() \
-            .execute()
+        response = await asyncio.to_thread(
+            supabase.table('hedera_users')
+            .select('*')
+            .eq('wallet_address', wallet_address)
+            .single()
+            .execute
+        )
 
         return response.data if response.data else None
 
     except Exception as e:
-        logger.error(f"Error fetching user profile for {wallet_address}: {e}")
+        logger.error("Error fetching user profile for %s: %s", wallet_address, e)
         return None
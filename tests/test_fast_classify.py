@@ -0,0 +1,30 @@
+import pytest
+
+from agent import _fast_classify
+
+
+def _parks(location_type, value):
+    return {"intent": "show_parks", "locationType": location_type, "locationValue": value}
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("94103", _parks("zip", "94103")),
+    ("show parks in 94103", _parks("zip", "94103")),
+    ("parks near zip code 10001 please", _parks("zip", "10001")),
+    ("show parks in the city of Austin", _parks("city", "Austin")),
+    ("show me parks in city Austin please", _parks("city", "Austin")),
+    ("parks in the city of St. Louis?", _parks("city", "St. Louis")),
+    ("show parks in the state of Texas", _parks("state", "Texas")),
+    ("parks in state New York now", _parks("state", "New York")),
+    ("parks in state tx", _parks("state", "TX")),
+    ("parks near me", None),
+    ("show me parks in Austin please", None),
+    ("parks in california?", None),
+    ("show parks in LA", None),
+    ("parks in state ZZ", None),
+    ("parks in city LA", None),
+    ("hello", {"intent": "greeting"}),
+    ("how big is this park in hectares", {"intent": "ask_area", "unit": "hectares"}),
+])
+def test_fast_classify(message, expected):
+    assert _fast_classify(message) == expected
@@ -0,0 +1,24 @@
+import pytest
+
+from agent import _fundraising_answer
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("yes", True),
+    ("Yeah sure", True),
+    ("enable fundraising", True),
+    ("yes, let's fund it", True),
+    ("no", False),
+    ("nope", False),
+    ("no fundraising", False),
+    ("skip fundraising", False),
+    ("No funding needed", False),
+    ("I don't want fundraising", False),
+    ("don't enable it", False),
+    ("sure, no problem", None),
+    ("yes without a doubt", None),
+    ("I don't know", None),
+    ("maybe later", None),
+])
+def test_fundraising_answer(message, expected):
+    assert _fundraising_answer(message) is expected
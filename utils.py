@@ -35,13 +35,13 @@ def compute_ndvi(geometry):
     collection = ee.ImageCollection("LANDSAT/LC08/C02/T1_L2") \
         .filterBounds(geometry) \
         .filterDate("2022-06-01", "2022-09-01") \
-        .sort("CLOUD_COVER") \
-        .map(lambda img: img.multiply(0.0000275).add(-0.2))
+        .select(['SR_B5', 'SR_B4'])
 
-    def add_ndvi(image):
-        return image.addBands(image.normalizedDifference(['SR_B5', 'SR_B4']).rename('NDVI'))
+    def to_ndvi(image):
+        scaled = image.multiply(0.0000275).add(-0.2)
+        return scaled.normalizedDifference(['SR_B5', 'SR_B4']).rename('NDVI')
 
-    ndvi_img = collection.map(add_ndvi).select('NDVI').median()
+    ndvi_img = collection.map(to_ndvi).median()
     stats = ndvi_img.reduceRegion(
         reducer=ee.Reducer.mean(),
         geometry=geometry,